@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: Apache-2.0
+"""A benchmark of the import time of the proxy's command-line entry points.
+
+Each module is imported in a fresh interpreter (with ``-X importtime``).  The benchmark exits
+with a non-zero status if a module imports one of the heavy optional dependencies which must
+only be loaded on demand, or if its import takes longer than the given budget.
+
+Usage: PYTHONPATH=src python benchmarks/import_time.py [--budget-ms N] [--runs N]
+"""
+
+import argparse
+import subprocess
+import sys
+from typing import Set, Tuple
+
+# Entry point module -> top-level packages it must not import at startup
+ENTRY_POINTS = {
+    "spark_connect_proxy.server": {"pyspark", "grpc_channelz", "jwt", "OpenSSL"},
+    "spark_connect_proxy.utilities.create_jwt": {"pyspark", "grpc", "jwt", "OpenSSL"},
+    "spark_connect_proxy.utilities.tls_utilities": {"pyspark", "grpc", "jwt", "OpenSSL"},
+}
+
+
+def _import_once(module: str) -> Tuple[float, Set[str]]:
+    """Import the module in a fresh interpreter - returning its import time (ms), and the top-level packages loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header line
+        packages.add(name.strip().split(".")[0])
+        # Top-level imports are not indented - their cumulative times add up to the total
+        if name.startswith(" ") and not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1000, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="The maximum import time allowed per module.")
+    parser.add_argument("--runs", type=int, default=5, help="The number of imports to time per module (the best is used).")
+    args = parser.parse_args()
+
+    failures = []
+    for module, forbidden in ENTRY_POINTS.items():
+        timings = []
+        packages = set()
+        for _ in range(args.runs):
+            elapsed_ms, packages = _import_once(module=module)
+            timings.append(elapsed_ms)
+        best_ms = min(timings)
+        print(f"{module:<48} {best_ms:8.1f} ms")
+
+        unexpected = sorted(forbidden & packages)
+        if unexpected:
+            failures.append(f"{module} imports: {', '.join(unexpected)}")
+        if best_ms > args.budget_ms:
+            failures.append(f"{module} took {best_ms:.1f} ms to import (budget: {args.budget_ms:.1f} ms)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
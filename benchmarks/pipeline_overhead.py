@@ -0,0 +1,97 @@
+# SPDX-License-Identifier: Apache-2.0
+"""A microbenchmark of the per-call overhead of the proxy's call pipeline.
+
+Usage: PYTHONPATH=src python benchmarks/pipeline_overhead.py [--calls N]
+"""
+
+import argparse
+import logging
+import time
+import timeit
+from typing import NamedTuple, Tuple
+
+import grpc
+import jwt
+
+from spark_connect_proxy.pipeline import CallPipeline, LoggingStage
+from spark_connect_proxy.security import BearerTokenAuthStage
+
+SERVICE = "spark.connect.SparkConnectService"
+METHOD = "Config"
+SECRET_KEY = "benchmark-secret-key-of-at-least-32-bytes"
+AUDIENCE = "spark-client"
+
+
+class _HandlerCallDetails(NamedTuple):
+    method: str
+    invocation_metadata: Tuple[Tuple[str, str], ...]
+
+
+class _ServicerContext:
+    """A minimal stand-in for grpc.ServicerContext."""
+
+    def __init__(self, metadata: Tuple[Tuple[str, str], ...]):
+        self._metadata = metadata
+
+    def invocation_metadata(self):
+        return self._metadata
+
+    def peer(self) -> str:
+        return "ipv4:127.0.0.1:54321"
+
+    def abort(self, code, details):
+        raise RuntimeError(f"{code}: {details}")
+
+
+def _behavior(request, context):
+    return request
+
+
+def _time_per_call(pipeline: CallPipeline, context: _ServicerContext, calls: int) -> float:
+    """Return the mean time (in microseconds) to resolve the handler and invoke it once."""
+    method_handlers = {METHOD: grpc.unary_unary_rpc_method_handler(_behavior)}
+    pipeline.precompute(service=SERVICE, method_handlers=method_handlers)
+    details = _HandlerCallDetails(method=f"/{SERVICE}/{METHOD}", invocation_metadata=context.invocation_metadata())
+
+    def continuation(handler_call_details):
+        return method_handlers[METHOD]
+
+    def one_call():
+        pipeline.intercept_service(continuation, details).unary_unary(b"", context)
+
+    return min(timeit.repeat(one_call, number=calls, repeat=5)) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100_000, help="The number of calls per timing run.")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("pipeline-benchmark")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    token = jwt.encode(payload={"sub": "benchmark", "aud": AUDIENCE, "exp": time.time() + 3600},
+                       key=SECRET_KEY, algorithm="HS256")
+    context = _ServicerContext(metadata=(("user-agent", "grpc-python/1.66"),
+                                         ("authorization", f"Bearer {token}")))
+
+    baseline = min(timeit.repeat(lambda: _behavior(b"", context), number=args.calls, repeat=5)) / args.calls * 1e6
+    scenarios = {
+        "no stages": CallPipeline(stages=[]),
+        "logging (debug off)": CallPipeline(stages=[LoggingStage(logger=logger)]),
+        "logging (debug off) + auth": CallPipeline(stages=[
+            LoggingStage(logger=logger),
+            BearerTokenAuthStage(audience=AUDIENCE, secret_key=SECRET_KEY, logger=logger),
+        ]),
+    }
+
+    print(f"{'direct call':<30} {baseline:8.2f} us/call")
+    for name, pipeline in scenarios.items():
+        per_call = _time_per_call(pipeline=pipeline, context=context, calls=args.calls)
+        print(f"{name:<30} {per_call:8.2f} us/call  (overhead: {per_call - baseline:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
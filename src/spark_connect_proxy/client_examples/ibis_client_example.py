@@ -10,7 +10,7 @@ from ibis import _
 from pyspark.sql import SparkSession
 
 from ..config import SERVER_PORT
-from ..logger import logger
+from ..logger import logger, setup_logging
 
 # Constants
 TIMER_TEXT = "{name}: Elapsed time: {:.4f} seconds"
@@ -128,6 +128,7 @@ def click_run_client_example(host: str,
                              tls_roots: str,
                              token: str
                              ):
+    setup_logging()
     run_client_example(**locals())
 
 
@@ -1,12 +1,15 @@
 import logging
 import os
 import sys
-
-# Setup logging
-logging.basicConfig(format='%(asctime)s - %(levelname)-8s %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S %Z',
-                    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper()),
-                    stream=sys.stdout
-                    )
+from typing import Optional
 
 logger = logging.getLogger()
+
+
+def setup_logging(log_level: Optional[str] = None):
+    """Configure logging - called by each command, rather than at import time."""
+    logging.basicConfig(format='%(asctime)s - %(levelname)-8s %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S %Z',
+                        level=getattr(logging, (log_level or os.getenv("LOG_LEVEL", "INFO")).upper()),
+                        stream=sys.stdout
+                        )
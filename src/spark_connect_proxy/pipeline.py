@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+"""A fused gRPC call pipeline for the proxy.
+
+Rather than chaining one ``grpc.ServerInterceptor`` per concern, the proxy runs a single
+interceptor which wraps every method handler once (with only the stages which apply to that
+method), and parses the call metadata once per call into a ``CallContext`` which is shared by
+all stages (logging, auth, metrics, limits, ...).
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+import grpc
+
+
+class CallRejected(Exception):
+    """Raised by a pipeline stage to abort a call with the given gRPC status."""
+
+    def __init__(self, code: grpc.StatusCode, details: str):
+        """Initialize the CallRejected exception."""
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+
+class CallContext:
+    """The per-call state shared by all stages of the pipeline."""
+
+    __slots__ = ("method", "context", "metadata", "principal")
+
+    def __init__(self, method: str, context: grpc.ServicerContext):
+        """Initialize the CallContext - parsing the invocation metadata once."""
+        self.method = method
+        self.context = context
+        self.metadata = dict(context.invocation_metadata())
+        self.principal: Optional[str] = None
+
+    @property
+    def peer(self) -> str:
+        """Return the address of the calling client."""
+        return self.context.peer()
+
+
+class PipelineStage:
+    """A stage of the call pipeline - subclasses override ``on_call``."""
+
+    def applies_to(self, method: str) -> bool:
+        """Return whether this stage should run for the given method - evaluated once at startup."""
+        return True
+
+    def on_call(self, call: CallContext) -> None:
+        """Handle an incoming call - raise ``CallRejected`` to abort it."""
+
+
+class LoggingStage(PipelineStage):
+    """A pipeline stage which logs incoming calls at DEBUG level."""
+
+    def __init__(self, logger: logging.Logger):
+        """Initialize the LoggingStage."""
+        self.logger = logger
+
+    def applies_to(self, method: str) -> bool:
+        """Only run when debug logging is enabled."""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def on_call(self, call: CallContext) -> None:
+        """Log the method and peer of the incoming call."""
+        self.logger.debug("Received call for method %s from %s", call.method, call.peer)
+
+
+_HANDLER_FACTORIES = {
+    (False, False): ("unary_unary", grpc.unary_unary_rpc_method_handler),
+    (False, True): ("unary_stream", grpc.unary_stream_rpc_method_handler),
+    (True, False): ("stream_unary", grpc.stream_unary_rpc_method_handler),
+    (True, True): ("stream_stream", grpc.stream_stream_rpc_method_handler),
+}
+
+
+class CallPipeline(grpc.ServerInterceptor):
+    """A single interceptor which runs the pipeline stages in front of each method handler."""
+
+    def __init__(self, stages: Iterable[PipelineStage]):
+        """Initialize the CallPipeline."""
+        self.stages = tuple(stages)
+        self._handlers: Dict[str, grpc.RpcMethodHandler] = {}
+
+    def wrap(self, method: str, handler: grpc.RpcMethodHandler) -> grpc.RpcMethodHandler:
+        """Return the handler wrapped with the stages which apply to the given method."""
+        hooks = tuple(stage.on_call for stage in self.stages if stage.applies_to(method))
+        if not hooks:
+            return handler
+
+        attribute, factory = _HANDLER_FACTORIES[(handler.request_streaming, handler.response_streaming)]
+        behavior = getattr(handler, attribute)
+
+        def wrapped_behavior(request_or_iterator, context):
+            call = CallContext(method=method, context=context)
+            try:
+                for hook in hooks:
+                    hook(call)
+            except CallRejected as e:
+                # abort() raises - and works for every cardinality of handler
+                context.abort(e.code, e.details)
+            return behavior(request_or_iterator, context)
+
+        return factory(
+            wrapped_behavior,
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    def precompute(
+            self, service: str, method_handlers: Dict[str, grpc.RpcMethodHandler]
+    ) -> grpc.GenericRpcHandler:
+        """Wrap the service's method handlers up front, and return a generic handler serving them."""
+        wrapped_handlers = {}
+        for name, handler in method_handlers.items():
+            wrapped_handler = self.wrap(method=f"/{service}/{name}", handler=handler)
+            self._handlers[f"/{service}/{name}"] = wrapped_handler
+            wrapped_handlers[name] = wrapped_handler
+
+        return grpc.method_handlers_generic_handler(service, wrapped_handlers)
+
+    def intercept_service(self, continuation, handler_call_details):
+        """Return the precomputed handler for the method - wrapping (once) any not seen before."""
+        method = handler_call_details.method
+        handler = self._handlers.get(method)
+        if handler is None:
+            handler = continuation(handler_call_details)
+            if handler is not None:
+                handler = self._handlers.setdefault(method, self.wrap(method=method, handler=handler))
+        return handler
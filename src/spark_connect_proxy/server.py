@@ -1,4 +1,3 @@
-import logging
 import os
 from concurrent import futures
 from pathlib import Path
@@ -6,32 +5,19 @@ from typing import List, Optional
 
 import click
 import grpc
-import pyspark.sql.connect.proto.base_pb2_grpc as pb2_grpc
-from grpc_channelz.v1 import channelz
 
 from . import __version__ as spark_connect_proxy_version
 from .config import SPARK_CONNECT_SERVER_DEFAULT_URL, SERVER_PORT, DEFAULT_JWT_AUDIENCE
-from .logger import logger
-from .security import BearerTokenAuthInterceptor
+from .logger import logger, setup_logging
+from .pipeline import CallPipeline, LoggingStage
+from .service import SPARK_CONNECT_SERVICE_NAME, SparkConnectStub, spark_connect_method_handlers
 
 # Misc. Constants
 SPARK_CONNECT_PROXY_VERSION = spark_connect_proxy_version
 
 
-class LoggingInterceptor(grpc.ServerInterceptor):
-    def intercept_service(self, continuation, handler_call_details):
-        # Log the incoming connection details
-        method_name = handler_call_details.method
-        peer = handler_call_details.invocation_metadata[0].value  # Peer info
-
-        logging.debug(msg=f"Received connection for method {method_name} from {peer}")
-
-        # Call the actual RPC method
-        return continuation(handler_call_details)
-
-
-class SparkConnectProxyServicer(pb2_grpc.SparkConnectServiceServicer):
-    """A gRPC servicer that proxies requests to the Spark Connect server."""
+class SparkConnectProxyServicer:
+    """A gRPC servicer that proxies (serialized) requests to the Spark Connect server."""
 
     def __init__(self, stub):
         self.stub = stub
@@ -46,7 +32,7 @@ class SparkConnectProxyServicer(pb2_grpc.SparkConnectServiceServicer):
         return self.stub.Config(request=request)
 
     def AddArtifacts(self, request_iterator, context):
-        return self.stub.AddArtifacts(request=request_iterator)
+        return self.stub.AddArtifacts(request_iterator=request_iterator)
 
     def ArtifactStatus(self, request, context):
         return self.stub.ArtifactStatus(request=request)
@@ -71,6 +57,7 @@ def serve(
         jwt_audience: Optional[str] = None,
         secret_key: Optional[str] = None,
         log_level: str = "INFO",
+        enable_channelz: bool = True,
 ):
     """Start the Spark Connect Proxy server."""
     if version:
@@ -81,32 +68,42 @@ def serve(
     if arg_dict.pop("secret_key"):
         arg_dict["secret_key"] = "(redacted)"
 
+    setup_logging(log_level=log_level)
     logger.info(
         msg=f"Initializing Spark Connect Proxy server - version: {SPARK_CONNECT_PROXY_VERSION} - args: {arg_dict}")
     logger.info(msg=f"Proxying Spark Connect server at: {spark_connect_server_url}")
 
     # Set up the Spark Connect gRPC client (without TLS)
     channel = grpc.insecure_channel(target=spark_connect_server_url)
-    stub = pb2_grpc.SparkConnectServiceStub(channel=channel)
+    stub = SparkConnectStub(channel=channel)
 
-    interceptors = [LoggingInterceptor()]
+    stages = [LoggingStage(logger=logger)]
     if enable_auth:
         if not secret_key:
             raise ValueError("Secret key must be provided when enabling auth.")
-        interceptors.append(
-            BearerTokenAuthInterceptor(audience=jwt_audience, secret_key=secret_key, logger=logger)
+
+        # Imported here - so that the JWT library is only loaded when auth is enabled
+        from .security import BearerTokenAuthStage
+
+        stages.append(
+            BearerTokenAuthStage(audience=jwt_audience, secret_key=secret_key, logger=logger)
         )
         logger.info(msg="Token authentication is required for client connections.")
     else:
         logger.warning(msg="Token authentication is disabled - client connections will be insecure.")
 
+    # A single fused interceptor runs the stages for every service (including channelz)
+    pipeline = CallPipeline(stages=stages)
     server = grpc.server(
-        thread_pool=futures.ThreadPoolExecutor(max_workers=10), interceptors=interceptors
+        thread_pool=futures.ThreadPoolExecutor(max_workers=10), interceptors=[pipeline]
     )
 
-    # Add the proxy service
+    # Add the proxy service - with its method handlers wrapped by the pipeline up front
     proxy_servicer = SparkConnectProxyServicer(stub)
-    pb2_grpc.add_SparkConnectServiceServicer_to_server(servicer=proxy_servicer, server=server)
+    server.add_generic_rpc_handlers(
+        (pipeline.precompute(service=SPARK_CONNECT_SERVICE_NAME,
+                             method_handlers=spark_connect_method_handlers(servicer=proxy_servicer)),)
+    )
 
     server_credentials = None
     if tls:
@@ -132,7 +129,12 @@ def serve(
     else:
         server.add_insecure_port(address=f"[::]:{port}")
 
-    channelz.add_channelz_servicer(server)
+    if enable_channelz:
+        # Imported here - as channelz (and its generated protobuf modules) is slow to import
+        from grpc_channelz.v1 import channelz
+
+        channelz.add_channelz_servicer(server)
+        logger.info(msg="Channelz is enabled.")
 
     logger.info(
         f"Starting SparkConnect Proxy server - version: {SPARK_CONNECT_PROXY_VERSION} - listening on port: {port}")
@@ -213,6 +215,14 @@ def serve(
     required=True,
     help="The logging level to use for the server.",
 )
+@click.option(
+    "--enable-channelz/--no-enable-channelz",
+    type=bool,
+    default=os.getenv("ENABLE_CHANNELZ", "True").upper() == "TRUE",
+    show_default=True,
+    required=True,
+    help="Enable the gRPC channelz service for server introspection.",
+)
 def click_serve(
         version: bool,
         spark_connect_server_url: str,
@@ -223,6 +233,7 @@ def click_serve(
         jwt_audience: str,
         secret_key: str,
         log_level: str,
+        enable_channelz: bool,
 ):
     return serve(**locals())
 
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: Apache-2.0
+"""The Spark Connect gRPC service definition - as needed by the proxy.
+
+The proxy only forwards messages, so it never needs to parse them - it describes the
+SparkConnectService by method name and cardinality alone, and passes the serialized
+request/response bytes straight through.  This avoids importing pyspark (and its generated
+protobuf modules) at startup, and the cost of (de)serializing every message.
+"""
+
+from typing import Dict, NamedTuple
+
+import grpc
+
+SPARK_CONNECT_SERVICE_NAME = "spark.connect.SparkConnectService"
+
+
+class SparkConnectMethod(NamedTuple):
+    """A SparkConnectService method's name and cardinality."""
+
+    name: str
+    request_streaming: bool
+    response_streaming: bool
+
+    @property
+    def path(self) -> str:
+        """Return the fully qualified method path - ie: /<service>/<method>."""
+        return f"/{SPARK_CONNECT_SERVICE_NAME}/{self.name}"
+
+
+# The methods of spark.connect.SparkConnectService (see: spark/connect/base.proto)
+SPARK_CONNECT_METHODS = (
+    SparkConnectMethod(name="ExecutePlan", request_streaming=False, response_streaming=True),
+    SparkConnectMethod(name="AnalyzePlan", request_streaming=False, response_streaming=False),
+    SparkConnectMethod(name="Config", request_streaming=False, response_streaming=False),
+    SparkConnectMethod(name="AddArtifacts", request_streaming=True, response_streaming=False),
+    SparkConnectMethod(name="ArtifactStatus", request_streaming=False, response_streaming=False),
+    SparkConnectMethod(name="Interrupt", request_streaming=False, response_streaming=False),
+    SparkConnectMethod(name="ReattachExecute", request_streaming=False, response_streaming=True),
+    SparkConnectMethod(name="ReleaseExecute", request_streaming=False, response_streaming=False),
+)
+
+_HANDLER_FACTORIES = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+class SparkConnectStub:
+    """A SparkConnectService client stub which sends and receives serialized message bytes."""
+
+    def __init__(self, channel: grpc.Channel):
+        """Initialize the SparkConnectStub - with a multi-callable per method."""
+        for method in SPARK_CONNECT_METHODS:
+            if method.request_streaming:
+                multi_callable = channel.stream_stream if method.response_streaming else channel.stream_unary
+            else:
+                multi_callable = channel.unary_stream if method.response_streaming else channel.unary_unary
+            setattr(self, method.name, multi_callable(method.path))
+
+
+def spark_connect_method_handlers(servicer) -> Dict[str, grpc.RpcMethodHandler]:
+    """Return the SparkConnectService method handlers (by method name) - serving bytes - for the given servicer."""
+    method_handlers = {}
+    for method in SPARK_CONNECT_METHODS:
+        factory = _HANDLER_FACTORIES[(method.request_streaming, method.response_streaming)]
+        method_handlers[method.name] = factory(getattr(servicer, method.name))
+    return method_handlers
@@ -1,23 +1,12 @@
 # SPDX-License-Identifier: Apache-2.0
 """A utility to create a JWT token for the gateway."""
 
-import logging
 import os
 import time
-import sys
 
 import click
-import jwt
 from ..config import DEFAULT_JWT_SUBJECT, DEFAULT_JWT_ISSUER, DEFAULT_JWT_AUDIENCE, DEFAULT_JWT_LIFETIME
-
-# Setup logging
-logging.basicConfig(format='%(asctime)s - %(levelname)-8s %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S %Z',
-                    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper()),
-                    stream=sys.stdout
-                    )
-
-logger = logging.getLogger()
+from ..logger import logger, setup_logging
 
 
 def create_jwt(
@@ -28,6 +17,9 @@ def create_jwt(
         secret_key: str
 ):
     """Create a JWT token for the given issuer, subject, audience, lifetime and secret key."""
+    # Imported here - so that the JWT library is not loaded just to show the CLI help
+    import jwt
+
     iat = time.time()
     exp = iat + lifetime
     payload = {"iss": issuer, "sub": subject, "aud": audience, "iat": iat, "exp": exp}
@@ -82,6 +74,7 @@ def click_create_jwt(issuer: str,
                      lifetime: int,
                      secret_key: str
                      ):
+    setup_logging()
     create_jwt(**locals())
 
 
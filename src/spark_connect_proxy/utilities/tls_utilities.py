@@ -6,14 +6,15 @@ import socket
 from pathlib import Path
 
 import click
-from OpenSSL import crypto
 
 from ..config import DEFAULT_CERT_FILE, DEFAULT_KEY_FILE
-from ..logger import logger
+from ..logger import logger, setup_logging
 
 
 def _gen_pyopenssl(common_name: str) -> tuple[bytes, bytes]:
     """Generate a self-signed certificate using pyOpenSSL."""
+    # Imported here - so that pyOpenSSL is not loaded just to show the CLI help
+    from OpenSSL import crypto
 
     # Generate RSA private key
     private_key = crypto.PKey()
@@ -142,6 +143,7 @@ def click_create_tls_keypair(cert_file: str,
                              common_name: str
                              ):
     """Provide a click interface to create a self-signed TLS key pair."""
+    setup_logging()
     create_tls_keypair(**locals())
 
 